@@ -1,6 +1,7 @@
 import os
 from enum import Enum
-from pydantic import BaseModel, Field
+from functools import cache, lru_cache
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Any, Optional, Literal
 
 from langchain_core.runnables import RunnableConfig
@@ -16,6 +17,9 @@ class SearchAPI(Enum):
 class Configuration(BaseModel):
     """The configurable fields for the research assistant."""
 
+    # Instances are memoized and shared across nodes and runs
+    model_config = ConfigDict(frozen=True)
+
     max_web_research_loops: int = Field(
         default=3,
         title="Research Depth",
@@ -69,13 +73,34 @@ class Configuration(BaseModel):
             config["configurable"] if config and "configurable" in config else {}
         )
 
-        # Get raw values from environment or config
-        raw_values: dict[str, Any] = {
-            name: os.environ.get(name.upper(), configurable.get(name))
-            for name in cls.model_fields.keys()
-        }
+        # Get raw values from environment or config in a single pass
+        environ = os.environ
+        raw_values: tuple[tuple[str, Any], ...] = tuple(
+            (name, environ.get(env_name, configurable.get(name)))
+            for name, env_name in _field_env_names(cls)
+        )
+
+        try:
+            hash(raw_values)
+        except TypeError:
+            # Unhashable configurable values can't be memoized
+            return _build_config.__wrapped__(cls, raw_values)
+
+        return _build_config(cls, raw_values)
+
+
+@cache
+def _field_env_names(cls: type[Configuration]) -> tuple[tuple[str, str], ...]:
+    """Map each configuration field to the environment variable that overrides it."""
+    return tuple((name, name.upper()) for name in cls.model_fields)
+
 
-        # Filter out None values
-        values = {k: v for k, v in raw_values.items() if v is not None}
+@lru_cache(maxsize=32)
+def _build_config(
+    cls: type[Configuration], raw_values: tuple[tuple[str, Any], ...]
+) -> Configuration:
+    """Build a Configuration from raw values, memoized across graph nodes."""
+    # Filter out None values
+    values = {k: v for k, v in raw_values if v is not None}
 
-        return cls(**values)
+    return cls(**values)
@@ -1,12 +1,14 @@
-import json
+import logging
+from functools import lru_cache
+from typing import Optional
 
+import orjson
 from pydantic import BaseModel, Field
 from typing_extensions import Literal
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langchain_ollama import ChatOllama
 from langgraph.graph import START, END, StateGraph
 
 from ollama_deep_researcher.configuration import Configuration, SearchAPI
@@ -35,12 +37,55 @@ from ollama_deep_researcher.prompts import (
     json_mode_reflection_instructions,
     tool_calling_reflection_instructions,
 )
-from ollama_deep_researcher.lmstudio import ChatLMStudio
+
+# Set up logging
+logger = logging.getLogger(__name__)
 
 # Constants
 MAX_TOKENS_PER_SOURCE = 1000
 CHARS_PER_TOKEN = 4
 
+# System prompt templates, joined with their structured output instructions once
+JSON_MODE_QUERY_PROMPT = query_writer_instructions + json_mode_query_instructions
+TOOL_CALLING_QUERY_PROMPT = query_writer_instructions + tool_calling_query_instructions
+JSON_MODE_REFLECTION_PROMPT = (
+    reflection_instructions + json_mode_reflection_instructions
+)
+TOOL_CALLING_REFLECTION_PROMPT = (
+    reflection_instructions + tool_calling_reflection_instructions
+)
+
+
+# Structured output tools
+@tool
+class Query(BaseModel):
+    """
+    This tool is used to generate a query for web search.
+    """
+
+    query: str = Field(description="The actual search query string")
+    rationale: str = Field(
+        description="Brief explanation of why this query is relevant"
+    )
+
+
+@tool
+class FollowUpQuery(BaseModel):
+    """
+    This tool is used to generate a follow-up query to address a knowledge gap.
+    """
+
+    follow_up_query: str = Field(
+        description="Write a specific question to address this gap"
+    )
+    knowledge_gap: str = Field(
+        description="Describe what information is missing or needs clarification"
+    )
+
+
+_TOOLS_BY_NAME = {t.name: t for t in (Query, FollowUpQuery)}
+
+
 def generate_search_query_with_structured_output(
     configurable: Configuration,
     messages: list,
@@ -63,7 +108,7 @@ def generate_search_query_with_structured_output(
         Dictionary with "search_query" key
     """
     if configurable.use_tool_calling:
-        llm = get_llm(configurable).bind_tools([tool_class])
+        llm = get_llm_with_tools(configurable, tool_class)
         result = llm.invoke(messages)
 
         if not result.tool_calls:
@@ -80,20 +125,68 @@ def generate_search_query_with_structured_output(
         # Use JSON mode
         llm = get_llm(configurable)
         result = llm.invoke(messages)
-        print(f"result: {result}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLM result: %s", result)
         content = result.content
+        if configurable.strip_thinking_tokens:
+            content = strip_thinking_tokens(content)
 
         try:
-            parsed_json = json.loads(content)
+            parsed_json = orjson.loads(content)
             search_query = parsed_json.get(json_query_field)
             if not search_query:
                 return {"search_query": fallback_query}
             return {"search_query": search_query}
-        except (json.JSONDecodeError, KeyError):
-            if configurable.strip_thinking_tokens:
-                content = strip_thinking_tokens(content)
+        except (orjson.JSONDecodeError, KeyError):
             return {"search_query": fallback_query}
 
+
+@lru_cache(maxsize=8)
+def _make_chat_ollama(
+    base_url: str, model: str, temperature: float, format: Optional[str]
+):
+    """Create a ChatOllama client, reusing instances across graph nodes.
+
+    Args:
+        base_url: Base URL for the Ollama API
+        model: Name of the model to use
+        temperature: Temperature for sampling
+        format: Format for the response ("json" or None); always pass it
+            explicitly so every caller shares the same cache key
+
+    Returns:
+        Cached ChatOllama instance
+    """
+    from langchain_ollama import ChatOllama
+
+    return ChatOllama(
+        base_url=base_url, model=model, temperature=temperature, format=format
+    )
+
+
+@lru_cache(maxsize=8)
+def _make_chat_lmstudio(
+    base_url: str, model: str, temperature: float, format: Optional[str]
+):
+    """Create a ChatLMStudio client, reusing instances across graph nodes.
+
+    Args:
+        base_url: Base URL for LMStudio's OpenAI-compatible API
+        model: Name of the model to use
+        temperature: Temperature for sampling
+        format: Format for the response ("json" or None); always pass it
+            explicitly so every caller shares the same cache key
+
+    Returns:
+        Cached ChatLMStudio instance
+    """
+    from ollama_deep_researcher.lmstudio import ChatLMStudio
+
+    return ChatLMStudio(
+        base_url=base_url, model=model, temperature=temperature, format=format
+    )
+
+
 def get_llm(configurable: Configuration):
     """Helper function to initialize LLM based on configuration.
 
@@ -105,34 +198,55 @@ def get_llm(configurable: Configuration):
     Returns:
         Configured LLM instance
     """
+    format = None if configurable.use_tool_calling else "json"
     if configurable.llm_provider == "lmstudio":
-        if configurable.use_tool_calling:
-            return ChatLMStudio(
-                base_url=configurable.lmstudio_base_url,
-                model=configurable.local_llm,
-                temperature=0,
-            )
-        else:
-            return ChatLMStudio(
-                base_url=configurable.lmstudio_base_url,
-                model=configurable.local_llm,
-                temperature=0,
-                format="json",
-            )
+        return _make_chat_lmstudio(
+            configurable.lmstudio_base_url, configurable.local_llm, 0, format
+        )
+    else:  # Default to Ollama
+        return _make_chat_ollama(
+            configurable.ollama_base_url, configurable.local_llm, 0, format
+        )
+
+
+def get_llm_with_tools(configurable: Configuration, tool_class):
+    """Get a cached LLM with a structured output tool bound.
+
+    Args:
+        configurable: Configuration object containing LLM settings
+        tool_class: Module-level tool to bind (Query or FollowUpQuery)
+
+    Returns:
+        Cached LLM runnable with the tool bound
+    """
+    if configurable.llm_provider == "lmstudio":
+        base_url = configurable.lmstudio_base_url
+    else:  # Default to Ollama
+        base_url = configurable.ollama_base_url
+    return _bind_tools(
+        configurable.llm_provider, base_url, configurable.local_llm, tool_class.name
+    )
+
+
+@lru_cache(maxsize=8)
+def _bind_tools(llm_provider: str, base_url: str, model: str, tool_name: str):
+    """Bind a structured output tool to a cached LLM client.
+
+    Args:
+        llm_provider: Provider for the LLM (ollama or lmstudio)
+        base_url: Base URL for the provider's API
+        model: Name of the model to use
+        tool_name: Name of the tool in _TOOLS_BY_NAME
+
+    Returns:
+        LLM runnable with the tool bound
+    """
+    if llm_provider == "lmstudio":
+        llm = _make_chat_lmstudio(base_url, model, 0, None)
     else:  # Default to Ollama
-        if configurable.use_tool_calling:
-            return ChatOllama(
-                base_url=configurable.ollama_base_url,
-                model=configurable.local_llm,
-                temperature=0,
-            )
-        else:
-            return ChatOllama(
-                base_url=configurable.ollama_base_url,
-                model=configurable.local_llm,
-                temperature=0,
-                format="json",
-            )
+        llm = _make_chat_ollama(base_url, model, 0, None)
+    return llm.bind_tools([_TOOLS_BY_NAME[tool_name]])
+
 
 # Nodes
 def generate_query(state: SummaryState, config: RunnableConfig):
@@ -149,33 +263,21 @@ def generate_query(state: SummaryState, config: RunnableConfig):
         Dictionary with state update, including search_query key containing the generated query
     """
 
-    # Format the prompt
-    current_date = get_current_date()
-    formatted_prompt = query_writer_instructions.format(
-        current_date=current_date, research_topic=state.research_topic
-    )
-
     # Generate a query
     configurable = Configuration.from_runnable_config(config)
 
-    @tool
-    class Query(BaseModel):
-        """
-        This tool is used to generate a query for web search.
-        """
-
-        query: str = Field(description="The actual search query string")
-        rationale: str = Field(
-            description="Brief explanation of why this query is relevant"
-        )
+    # Format the prompt
+    query_prompt = (
+        TOOL_CALLING_QUERY_PROMPT
+        if configurable.use_tool_calling
+        else JSON_MODE_QUERY_PROMPT
+    )
+    formatted_prompt = query_prompt.format(
+        current_date=get_current_date(), research_topic=state.research_topic
+    )
 
     messages = [
-        SystemMessage(
-            content=formatted_prompt + (
-                tool_calling_query_instructions if configurable.use_tool_calling 
-                else json_mode_query_instructions
-            )
-        ),
+        SystemMessage(content=formatted_prompt),
         HumanMessage(content="Generate a query for web search:"),
     ]
 
@@ -301,16 +403,12 @@ def summarize_sources(state: SummaryState, config: RunnableConfig):
 
     # For summarization, we don't need structured output, so always use regular mode
     if configurable.llm_provider == "lmstudio":
-        llm = ChatLMStudio(
-            base_url=configurable.lmstudio_base_url,
-            model=configurable.local_llm,
-            temperature=0,
+        llm = _make_chat_lmstudio(
+            configurable.lmstudio_base_url, configurable.local_llm, 0, None
         )
     else:  # Default to Ollama
-        llm = ChatOllama(
-            base_url=configurable.ollama_base_url,
-            model=configurable.local_llm,
-            temperature=0,
+        llm = _make_chat_ollama(
+            configurable.ollama_base_url, configurable.local_llm, 0, None
         )
 
     result = llm.invoke(
@@ -345,30 +443,15 @@ def reflect_on_summary(state: SummaryState, config: RunnableConfig):
 
     # Generate a query
     configurable = Configuration.from_runnable_config(config)
-    formatted_prompt = reflection_instructions.format(
-        research_topic=state.research_topic
+    reflection_prompt = (
+        TOOL_CALLING_REFLECTION_PROMPT
+        if configurable.use_tool_calling
+        else JSON_MODE_REFLECTION_PROMPT
     )
-
-    @tool
-    class FollowUpQuery(BaseModel):
-        """
-        This tool is used to generate a follow-up query to address a knowledge gap.
-        """
-
-        follow_up_query: str = Field(
-            description="Write a specific question to address this gap"
-        )
-        knowledge_gap: str = Field(
-            description="Describe what information is missing or needs clarification"
-        )
+    formatted_prompt = reflection_prompt.format(research_topic=state.research_topic)
 
     messages = [
-        SystemMessage(
-            content=formatted_prompt + (
-                tool_calling_reflection_instructions if configurable.use_tool_calling 
-                else json_mode_reflection_instructions
-            )
-        ),
+        SystemMessage(content=formatted_prompt),
         HumanMessage(
             content=f"Reflect on our existing knowledge: \n === \n {state.running_summary}, \n === \n And now identify a knowledge gap and generate a follow-up web search query:"
         ),
@@ -398,17 +481,9 @@ def finalize_summary(state: SummaryState):
         Dictionary with state update, including running_summary key containing the formatted final summary with sources
     """
 
-    # Deduplicate sources before joining
-    seen_sources = set()
-    unique_sources = []
-
-    for source in state.sources_gathered:
-        # Split the source into lines and process each individually
-        for line in source.split("\n"):
-            # Only process non-empty lines
-            if line.strip() and line not in seen_sources:
-                seen_sources.add(line)
-                unique_sources.append(line)
+    # Deduplicate non-empty source lines before joining, preserving order
+    lines = "\n".join(state.sources_gathered).split("\n")
+    unique_sources = dict.fromkeys(line for line in lines if line.strip())
 
     # Join the deduplicated sources
     all_sources = "\n".join(unique_sources)
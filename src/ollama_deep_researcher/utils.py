@@ -1,4 +1,6 @@
+import logging
 import os
+import re
 import httpx
 import requests
 from typing import Dict, Any, List, Union, Optional
@@ -10,8 +12,12 @@ from duckduckgo_search import DDGS
 
 from langchain_community.utilities import SearxSearchWrapper
 
+# Set up logging
+logger = logging.getLogger(__name__)
+
 # Constants
 CHARS_PER_TOKEN = 4
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
 
 
 def get_config_value(value: Any) -> str:
@@ -37,7 +43,8 @@ def strip_thinking_tokens(text: str) -> str:
     """
     Remove <think> and </think> tags and their content from the text.
 
-    Iteratively removes all occurrences of content enclosed in thinking tokens.
+    Removes all occurrences of content enclosed in thinking tokens in a single
+    pass using a precompiled, non-greedy pattern.
 
     Args:
         text (str): The text to process
@@ -45,11 +52,7 @@ def strip_thinking_tokens(text: str) -> str:
     Returns:
         str: The text with thinking tokens and their content removed
     """
-    while "<think>" in text and "</think>" in text:
-        start = text.find("<think>")
-        end = text.find("</think>") + len("</think>")
-        text = text[:start] + text[end:]
-    return text
+    return _THINK_RE.sub("", text)
 
 
 def deduplicate_and_format_sources(
@@ -112,7 +115,7 @@ def deduplicate_and_format_sources(
             raw_content = source.get("raw_content", "")
             if raw_content is None:
                 raw_content = ""
-                print(f"Warning: No raw_content found for source {source['url']}")
+                logger.warning("No raw_content found for source %s", source["url"])
             if len(raw_content) > char_limit:
                 raw_content = raw_content[:char_limit] + "... [truncated]"
             formatted_text += f"Full source content limited to {max_tokens_per_source} tokens: {raw_content}\n\n"
@@ -158,7 +161,7 @@ def fetch_raw_content(url: str) -> Optional[str]:
             response.raise_for_status()
             return markdownify(response.text)
     except Exception as e:
-        print(f"Warning: Failed to fetch full page content for {url}: {str(e)}")
+        logger.warning("Failed to fetch full page content for %s: %s", url, e)
         return None
 
 
@@ -196,7 +199,7 @@ def duckduckgo_search(
                 content = r.get("body")
 
                 if not all([url, title, content]):
-                    print(f"Warning: Incomplete result from DuckDuckGo: {r}")
+                    logger.warning("Incomplete result from DuckDuckGo: %s", r)
                     continue
 
                 raw_content = content
@@ -214,8 +217,7 @@ def duckduckgo_search(
 
             return {"results": results}
     except Exception as e:
-        print(f"Error in DuckDuckGo search: {str(e)}")
-        print(f"Full error details: {type(e).__name__}")
+        logger.error("Error in DuckDuckGo search (%s): %s", type(e).__name__, e)
         return {"results": []}
 
 
@@ -256,7 +258,7 @@ def searxng_search(
         content = r.get("snippet")
 
         if not all([url, title, content]):
-            print(f"Warning: Incomplete result from SearXNG: {r}")
+            logger.warning("Incomplete result from SearXNG: %s", r)
             continue
 
         raw_content = content